@@ -0,0 +1,119 @@
+import game
+from objects import SoftBody, Rect, all_particles
+from typing import Callable
+import csv
+import json
+import queue
+import threading
+import traceback
+
+
+
+class Diagnostics():
+    """
+    Measures the health of the simulation every `interval` steps
+
+    Each measurement is a dict, which is passed to `callback` and/or appended to the file at `path`,
+    the file is CSV if `path` ends in .csv, otherwise JSON lines
+
+    Only the measuring is done in the step loop, `callback` and the file writing are on a separate thread,
+    if they fall behind by `max_queued` measurements, new measurements are dropped (and counted) instead of queued
+
+    Measurements:
+    - step, number of steps so far
+    - time, simulated seconds so far
+    - step_time and max_step_time, the mean and max seconds each `update` took since the last measurement
+    - particles, number of Particles (including the Particles in SoftBodies)
+    - kinetic_energy and spring_energy, totals over every Particle and spring
+    - max_strain, the largest extension / length of any spring, and strains, the max_strain of each SoftBody by it's id
+    - max_penetration, the deepest any Particle is inside a Rect in pixels
+    - dropped, number of measurements dropped so far because the queue was full
+    """
+    def __init__(self, interval: int = 60, callback: Callable[[dict], None] | None = None, path: str | None = None, max_queued: int = 1000) -> None:
+        if interval < 1: raise ValueError(f"interval must be at least 1, not {interval}")
+        self.interval = interval
+        self.callback = callback
+        self.path = path
+
+        self.steps = 0
+        self.time = 0
+        self.step_times: list[float] = []
+        self.dropped = 0
+
+        self.queue: queue.Queue[dict | None] = queue.Queue(max_queued)
+        self.thread = threading.Thread(target=self.emit, daemon=True)
+        self.thread.start()
+
+    def record(self, delta_time: float, step_time: float) -> None:
+        """Call once per step, `step_time` is how long the step took to compute"""
+        self.steps += 1
+        self.time += delta_time
+        self.step_times.append(step_time)
+
+        if self.steps % self.interval == 0:
+            try:
+                self.queue.put_nowait(self.measure())
+            except queue.Full:
+                self.dropped += 1
+            self.step_times = []
+
+    def measure(self) -> dict:
+        particles = all_particles()
+        soft_bodies = [obj for obj in game.OBJECTS if isinstance(obj, SoftBody)]
+        rects = [obj for obj in game.OBJECTS if isinstance(obj, Rect)]
+
+        strains = {soft_body.id: soft_body.max_strain() for soft_body in soft_bodies}
+
+        max_penetration = 0
+        for rect in rects:
+            min_x, min_y, max_x, max_y = rect.bounds
+            for particle in particles:
+                if min_x <= particle.pos.x <= max_x and min_y <= particle.pos.y <= max_y:
+                    max_penetration = max(max_penetration, rect.penetration(particle.pos))
+
+        return {
+            "step": self.steps,
+            "time": self.time,
+            "step_time": sum(self.step_times) / len(self.step_times) if self.step_times else 0,
+            "max_step_time": max(self.step_times, default=0),
+            "particles": len(particles),
+            "kinetic_energy": sum(particle.kinetic_energy() for particle in particles),
+            "spring_energy": sum(particle.spring_energy() for soft_body in soft_bodies for particle in soft_body.particles),
+            "max_strain": max(strains.values(), default=0),
+            "strains": strains,
+            "max_penetration": max_penetration,
+            "dropped": self.dropped
+        }
+
+    def emit(self) -> None:
+        """Runs on the diagnostics thread, until `close` is called"""
+        file = open(self.path, "w", newline="") if self.path else None
+        writer = None
+        while (measurement := self.queue.get()) is not None:
+            # An error in one measurement shouldn't stop the rest from being emitted
+            if self.callback:
+                try:
+                    self.callback(measurement)
+                except Exception:
+                    traceback.print_exc()
+
+            if file is None: continue
+            try:
+                if self.path.endswith(".csv"):
+                    if writer is None:
+                        writer = csv.DictWriter(file, fieldnames=measurement.keys())
+                        writer.writeheader()
+                    writer.writerow({key: json.dumps(value) if isinstance(value, dict) else value for key, value in measurement.items()})
+                else:
+                    file.write(json.dumps(measurement) + "\n")
+                file.flush()
+
+            except Exception:
+                traceback.print_exc()
+
+        if file: file.close()
+
+    def close(self) -> None:
+        """Waits for every measurement to be emitted, then closes the file"""
+        self.queue.put(None)
+        self.thread.join()
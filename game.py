@@ -28,7 +28,16 @@ PUSH_PARTICLES = False
 SOFT_MODE = False
 
 OUTLINE = False
+FILL = False  # Fills in the outline of SoftBodies
 MIN_FPS = 60
+ADAPTIVE_TIMESTEP = True  # Split each frame into the largest safe steps, instead of one step per frame
+MAX_SUBSTEPS = 8  # Most steps in one frame, the simulation slows down instead of taking more
+MAX_TIMESTEP = 1/20  # Longest step the adaptive timestep takes, even when nothing is moving
+REPORT_ENERGY = False  # Show the change in total energy per second, needs ADAPTIVE_TIMESTEP
+ENERGY_DRIFT_WINDOW = 1  # Seconds the energy drift is averaged over
+DIAGNOSTICS_INTERVAL = 0  # Measure the simulation every DIAGNOSTICS_INTERVAL steps, 0 is off
+DIAGNOSTICS_PATH = "diagnostics.jsonl"  # .csv or .jsonl
+BULK_SPAWN_SIZE = 3  # Right click spawns a BULK_SPAWN_SIZE by BULK_SPAWN_SIZE block, leaving out SoftBodies which would overlap
 
 
 
@@ -42,3 +51,6 @@ RESTITUTION = 1
 PLAYER_SPRING_COEFFICIENT = 20
 PUSH_RANGE = 35  # In pixels
 PUSH_POWER = 10_000
+COURANT = 0.5  # Fraction of a particle's size it can move in one step
+TIMESTEP_SAFETY = 0.5  # 0 to 1, fraction of the longest step the springs are stable for
+TIMESTEP_TOLERANCE = 0  # Max position error of a step in pixels, 0 is no error estimation
@@ -1,19 +1,27 @@
 import game
-from objects import Vector, Particle, SoftBody, CircularSoftBody, Rect, Player_Spring, Player_Pusher
+from objects import Vector, Particle, SoftBody, CircularSoftBody, PolygonSoftBody, Rect, Player_Spring, Player_Pusher, grid_positions
 from ui import Canvas
+from timestep import Timestep
+from diagnostics import Diagnostics
 import time
 import pygame
 
 
 
 def update(delta_time):
+    time1 = time.perf_counter()
+
     for obj in game.OBJECTS:
         if hasattr(obj, "update"):
             obj.update(delta_time)
 
+    if diagnostics:
+        diagnostics.record(delta_time, time.perf_counter() - time1)
+
 def handle_events():
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            if diagnostics: diagnostics.close()
             pygame.quit()
 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # 1 is left click
@@ -23,6 +31,13 @@ def handle_events():
             else:
                 game.OBJECTS.add(Particle(Vector(x, y)))
 
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:  # 3 is right click, spawns a block of objects
+            x, y = pygame.mouse.get_pos()
+            if game.SOFT_MODE:
+                SoftBody.spawn_many(grid_positions(Vector(x, y), game.BULK_SPAWN_SIZE, game.BULK_SPAWN_SIZE, 3*game.SPRING_LENGTH), width=3, height=3, skip_overlapping=True)
+            else:
+                Particle.spawn_many(grid_positions(Vector(x, y), game.BULK_SPAWN_SIZE, game.BULK_SPAWN_SIZE, game.SPRING_LENGTH/2))
+
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
             game.FOLLOW_MOUSE = not game.FOLLOW_MOUSE
 
@@ -32,6 +47,9 @@ def handle_events():
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_o:
             game.OUTLINE = not game.OUTLINE
 
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+            game.FILL = not game.FILL
+
     keys_pressed = pygame.key.get_pressed()
 
     if keys_pressed[pygame.K_LCTRL]:
@@ -49,6 +67,15 @@ def draw(delta_time: float) -> None:
     label = font.render(f"FPS: {round(get_average_fps(delta_time))}", True, game.WHITE)
     game.WIN.blit(label, (8, 8))
 
+    if game.ADAPTIVE_TIMESTEP:
+        label = font.render(f"Steps: {timestep.substeps} x {timestep.step*1000:.1f}ms", True, game.WHITE)
+        game.WIN.blit(label, (8, 38))
+
+        # The energy is measured by the Timestep, so it's only known with adaptive steps
+        if game.REPORT_ENERGY:
+            label = font.render(f"Energy Drift: {round(timestep.energy_drift)}/s", True, game.WHITE)
+            game.WIN.blit(label, (8, 68))
+
     Canvas.draw()
 
     pygame.display.update()
@@ -87,6 +114,7 @@ def create_map():
     global soft_body
     soft_body = SoftBody(Vector(500, 50), width=4, height=4)
     #soft_body = CircularSoftBody(Vector(570, 100), 5, 50)
+    #soft_body = PolygonSoftBody(Vector(500, 50), [Vector(0, 0), Vector(160, 0), Vector(160, 120), Vector(80, 60), Vector(0, 120)], resolution=30)
     game.OBJECTS.add(soft_body)
 
     # Player stuff
@@ -99,6 +127,8 @@ def create_map():
     game.OBJECTS.add(Rect(Vector(260, 490), 300, 75, rotation=-25))
     game.OBJECTS.add(Rect(Vector(640, 640), 400, 75, rotation=30))
 
+timestep = Timestep()
+diagnostics = Diagnostics(game.DIAGNOSTICS_INTERVAL, path=game.DIAGNOSTICS_PATH) if game.DIAGNOSTICS_INTERVAL else None
 def main():
     delta_time = 0
     create_border()
@@ -110,12 +140,19 @@ def main():
 
         draw(delta_time)
 
-        update(delta_time)
+        if game.ADAPTIVE_TIMESTEP:
+            timestep.advance(delta_time, update)
+        else:
+            update(delta_time)
 
         handle_events()
 
         time2 = time.perf_counter()
-        delta_time = min(time2 - time1, 1/game.MIN_FPS)
+        if game.ADAPTIVE_TIMESTEP:
+            # The Timestep splits long frames into safe steps
+            delta_time = time2 - time1
+        else:
+            delta_time = min(time2 - time1, 1/game.MIN_FPS)
 
 
 if __name__ == "__main__":
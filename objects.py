@@ -1,4 +1,7 @@
 from __future__ import annotations
+from contextlib import contextmanager
+import gc
+import itertools
 import math
 import game
 import pygame
@@ -154,6 +157,109 @@ class Vector():
 
 
 
+def grid_positions(pos: Vector, columns: int, rows: int, gap: float) -> list[Vector]:
+    """Returns `columns` by `rows` positions, `gap` pixels apart, `pos` is the top left position"""
+    return [Vector(pos.x + x*gap, pos.y + y*gap) for x in range(columns) for y in range(rows)]
+
+
+
+@contextmanager
+def paused_gc():
+    """Pauses the garbage collector, which would otherwise repeatedly scan objects while lots are being created"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled: gc.enable()
+
+
+def all_particles() -> list[Particle]:
+    """Returns every Particle in `game.OBJECTS`, including the Particles of SoftBodies"""
+    particles: list[Particle] = []
+    for obj in game.OBJECTS:
+        if isinstance(obj, SoftBody): particles.extend(obj.particles)
+        elif isinstance(obj, Particle): particles.append(obj)
+    return particles
+
+
+def point_in_polygon(x: float, y: float, polygon: list[tuple[float, float]]) -> bool:
+    """Ray casting, counts how many edges of `polygon` a horizontal ray from (x, y) crosses"""
+    inside = False
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def closest_point_on_segment(point: Vector, a: Vector, b: Vector) -> Vector:
+    """Returns the point on the line segment from `a` to `b` which is closest to `point`"""
+    line = b - a
+    t = line.dot(point - a) / line.dot(line) if line else 0
+    return a + min(1, max(0, t)) * line
+
+
+def segment_intersection(a: Vector, b: Vector, c: Vector, d: Vector) -> tuple[float, float] | None:
+    """
+    Where the line segments from `a` to `b` and from `c` to `d` cross
+
+    Returns (s, t), the crossing point is `a + s*(b - a)` and `c + t*(d - c)`, or None if they don't cross
+    """
+    ab, cd, ac = b - a, d - c, c - a
+    denominator = ab.x*cd.y - ab.y*cd.x
+    if denominator == 0: return None  # Parallel
+    s = (ac.x*cd.y - ac.y*cd.x) / denominator
+    t = (ac.x*ab.y - ac.y*ab.x) / denominator
+    if 0 <= s <= 1 and 0 <= t <= 1: return s, t
+    return None
+
+
+def triangulate(points: list[tuple[float, float]]) -> list[tuple[int, int, int]]:
+    """
+    Delaunay triangulation of `points` (Bowyer-Watson algorithm)
+
+    Returns the triangles as indices into `points`
+    """
+    def circumcircle(a: int, b: int, c: int) -> tuple[float, float, float]:
+        (ax, ay), (bx, by), (cx, cy) = all_points[a], all_points[b], all_points[c]
+        d = 2 * (ax*(by - cy) + bx*(cy - ay) + cx*(ay - by))
+        if d == 0: return 0, 0, math.inf  # Collinear, so every point is "inside" and it gets removed
+        a2, b2, c2 = ax*ax + ay*ay, bx*bx + by*by, cx*cx + cy*cy
+        x = (a2*(by - cy) + b2*(cy - ay) + c2*(ay - by)) / d
+        y = (a2*(cx - bx) + b2*(ax - cx) + c2*(bx - ax)) / d
+        return x, y, (ax - x)**2 + (ay - y)**2
+
+    # Super triangle which contains every point
+    min_x, max_x = min(x for x, _ in points), max(x for x, _ in points)
+    min_y, max_y = min(y for _, y in points), max(y for _, y in points)
+    size = max(max_x - min_x, max_y - min_y, 1) * 10
+    mid_x, mid_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+    n = len(points)
+    all_points = list(points) + [(mid_x - 2*size, mid_y - size), (mid_x, mid_y + 2*size), (mid_x + 2*size, mid_y - size)]
+
+    triangles = {(n, n+1, n+2): circumcircle(n, n+1, n+2)}
+    for i, (px, py) in enumerate(points):
+        bad = [triangle for triangle, (x, y, r2) in triangles.items() if (px - x)**2 + (py - y)**2 < r2]
+
+        # The edges of the hole left by the bad triangles are the edges which aren't shared
+        edges: dict[tuple[int, int], int] = {}
+        for a, b, c in bad:
+            del triangles[(a, b, c)]
+            for edge in ((a, b), (b, c), (c, a)):
+                key = (min(edge), max(edge))
+                edges[key] = edges.get(key, 0) + 1
+
+        for (a, b), count in edges.items():
+            if count == 1:
+                triangles[(a, b, i)] = circumcircle(a, b, i)
+
+    # Remove triangles connected to the super triangle, and any flat triangles
+    return [triangle for triangle, (_, _, r2) in triangles.items() if max(triangle) < n and r2 != math.inf]
+
+
+
 class Object():
     __slots__ = ("pos", "colour")
     def __init__(self, pos: Vector, colour: Colour = game.WHITE) -> None:
@@ -172,6 +278,13 @@ class Particle(Object):
         self.size = size
         self.velocity = Vector(0, 0)
 
+    @classmethod
+    def spawn_many(cls, positions: list[Vector], *args, **kwargs) -> list[Particle]:
+        """Creates a Particle at each position and adds them all to `game.OBJECTS`"""
+        particles = [cls(pos, *args, **kwargs) for pos in positions]
+        game.OBJECTS.update(particles)
+        return particles
+
     def collide(self) -> None:
         for obj in game.OBJECTS:
             if not isinstance(obj, Rect): continue
@@ -209,14 +322,24 @@ class Particle(Object):
             closest = min([top, top_line], [right, right_line], [bottom, bottom_line], [left, left_line],
                           key=lambda pair: self.pos.distance_to(pair[0]))
 
-            self.pos = closest[0]
+            self.bounce(*closest)
+
+    def bounce(self, pos: Vector, line: Vector) -> None:
+        """Moves this particle to `pos` on `line`, and reflects it's velocity off the line"""
+        self.pos = pos
+
+        # Reflect this particle's velocity across the normal to the line our pos is at
+        line_angle = line.get_angle()
+        vel_angle = self.velocity.get_angle()
+        angle_diff = vel_angle - line_angle
+        self.velocity.rotate(2*angle_diff)  # 1 diff is parallel to line, 2 diff goes away from line
+
+    def kinetic_energy(self) -> float:
+        return 0.5 * self.velocity.dot(self.velocity)  # mass == 1
 
-            # Reflect this particle's velocity across the normal to the line our pos is at
-            line = closest[1]
-            line_angle = line.get_angle()
-            vel_angle = self.velocity.get_angle()
-            angle_diff = vel_angle - line_angle
-            self.velocity.rotate(2*angle_diff)  # 1 diff is parallel to line, 2 diff goes away from line
+    def energy(self) -> float:
+        """Kinetic + gravitational potential energy, y increases downwards"""
+        return self.kinetic_energy() - game.GRAVITY * self.pos.y
 
     def update(self, delta_time: float) -> None:
         # Air resistance
@@ -289,6 +412,7 @@ class SoftBodyParticle(Particle):
         """Accelerate this Particle with the Force from the springs connected to it's neighbours"""
         for neighbour, length in self.neighbours:
             distance = self.pos.distance_to(neighbour.pos)
+            if not distance: continue  # On top of each other, so there is no direction to push in
             extension = distance - length
             force = game.SPRING_COEFFICIENT * extension / length
             force = self.dampen(neighbour, force)
@@ -296,6 +420,14 @@ class SoftBodyParticle(Particle):
             acceleration.set_magnitude(force)  # Acceleration = Force, as mass == 1
             self.velocity += acceleration * delta_time
 
+    def spring_energy(self) -> float:
+        """Elastic potential energy of the springs connected to this Particle, each spring is shared so it's halved"""
+        energy = 0
+        for neighbour, length in self.neighbours:
+            extension = self.pos.distance_to(neighbour.pos) - length
+            energy += 0.25 * game.SPRING_COEFFICIENT * extension**2 / length
+        return energy
+
     def draw_springs(self) -> None:
         for neighbour, _ in self.neighbours:
             pygame.draw.line(game.WIN, game.CYAN, self.pos.to_tuple(), neighbour.pos.to_tuple(), width=3)
@@ -311,51 +443,283 @@ class ImmovableSoftBodyParticle(SoftBodyParticle):
 
 
 
+class SoftBodyTemplate():
+    """
+    The topology of a SoftBody, built once and stamped out for every SoftBody with the same shape
+
+    `offsets` are the positions of the particles relative to the SoftBody's `pos`
+
+    `springs` has a list of (neighbour index, spring length) for each particle
+
+    `boundary` is the indices of the particles on the outside of the SoftBody, in order around it
+
+    `stiffness` is the largest sum of 1 / spring length of a particle, times `game.SPRING_COEFFICIENT` is the stiffness
+    """
+    __slots__ = ("offsets", "springs", "boundary", "stiffness")
+    def __init__(self, offsets: list[tuple[float, float]], springs: list[list[tuple[int, float]]], boundary: list[int] | None = None) -> None:
+        self.offsets = offsets
+        self.springs = springs
+        self.boundary = boundary or []
+        self.stiffness = max((sum(1 / length for _, length in neighbours) for neighbours in springs), default=0)
+
+
+
 class SoftBody(Object):
     """
     Creates a lattice structure of SoftBodyParticles, in a square shape e.g. 8 neighbours per particle
 
     The SoftBodyParticles are spawned in a distance of `game.SPRING_LENGTH` from each other
 
+    `boundary` is the particles around the outside, in order, which are used for drawing the outline and collision
+
     `pos` is the position of the top left particle
 
     `width` and `height` are the number of particles of the dimensions of the SoftBody
+
+    `id` is unique to each SoftBody, and doesn't change
     """
-    __slots__ = ("width", "height", "particles")
+    __slots__ = ("id", "width", "height", "particles", "boundary", "bounds", "template")
+    templates: dict[tuple, SoftBodyTemplate] = {}
+    ids = itertools.count()
     def __init__(self, pos: Vector, width: int, height: int, colour: tuple[int, int, int] = game.RED) -> None:
         super().__init__(pos, colour)
+        self.id = next(SoftBody.ids)
         self.width = width
         self.height = height
         self.particles: list[SoftBodyParticle] = []
+        self.boundary: list[SoftBodyParticle] = []
         self.spawn_particles()
-
-    def spawn_particles(self) -> None:
-        # Create a list of particles at the correct positions
-        particles: list[list[SoftBodyParticle]] = []
-        for x in range(self.width):
-            particles.append([])
-            for y in range(self.height):
-                pos = Vector(self.pos.x + x*game.SPRING_LENGTH, self.pos.y + y* game.SPRING_LENGTH)
-                particles[x].append(SoftBodyParticle(pos, colour=self.colour))
-
-        # Set the neighbours of each particle and add the particle to self.particles
-        for x in range(self.width):
-            for y in range(self.height):
-                particle = particles[x][y]
+        self.update_bounds()
+
+    @classmethod
+    def spawn_many(cls, positions: list[Vector], *args, skip_overlapping: bool = False, **kwargs) -> list[SoftBody]:
+        """
+        Creates a SoftBody at each position and adds them all to `game.OBJECTS`
+
+        Only the first SoftBody is created normally, the rest are copies of it with it's template stamped at their position
+
+        `skip_overlapping` leaves out SoftBodies which would start inside a Rect or another SoftBody
+        """
+        if not positions: return []
+        with paused_gc():
+            first = cls(positions[0], *args, **kwargs)
+            bodies = [first] + [first.copy_to(pos) for pos in positions[1:]]
+        if skip_overlapping:
+            bodies = [body for body in bodies if not body.is_overlapping()]
+        game.OBJECTS.update(bodies)
+        return bodies
+
+    def copy_to(self, pos: Vector) -> SoftBody:
+        """Returns a new SoftBody at `pos`, with the same shape and template as this one"""
+        body = object.__new__(type(self))
+        body.id = next(SoftBody.ids)
+        body.pos = pos.copy()
+        body.colour = self.colour
+        body.width = self.width
+        body.height = self.height
+        body.template = self.template
+        body.stamp_template()
+        body.update_bounds()
+        return body
+
+    def is_overlapping(self) -> bool:
+        """Whether this SoftBody is touching a Rect or a SoftBody in `game.OBJECTS`"""
+        min_x, min_y, max_x, max_y = self.bounds
+        polygon = [particle.pos.to_tuple() for particle in self.boundary]
+        for obj in game.OBJECTS:
+            if obj is self or not isinstance(obj, (Rect, SoftBody)): continue
+            other_min_x, other_min_y, other_max_x, other_max_y = obj.bounds
+            if min_x > other_max_x or max_x < other_min_x or min_y > other_max_y or max_y < other_min_y: continue
+
+            if isinstance(obj, Rect):
+                if any(obj.penetration(particle.pos) > 0 for particle in self.particles): return True
+                if any(point_in_polygon(corner.x, corner.y, polygon) for corner in obj.corners): return True
+
+            else:
+                other_polygon = [particle.pos.to_tuple() for particle in obj.boundary]
+                if any(point_in_polygon(*particle.pos.to_tuple(), other_polygon) for particle in self.particles): return True
+                if any(point_in_polygon(*particle.pos.to_tuple(), polygon) for particle in obj.particles): return True
+
+        return False
+
+    def template_key(self) -> tuple:
+        """SoftBodies with the same key share a SoftBodyTemplate"""
+        return type(self), self.width, self.height, game.SPRING_LENGTH
+
+    def get_template(self) -> SoftBodyTemplate:
+        key = self.template_key()
+        template = SoftBody.templates.get(key)
+        if template is None:
+            template = SoftBody.templates[key] = self.create_template()
+        return template
+
+    def create_template(self) -> SoftBodyTemplate:
+        length = game.SPRING_LENGTH
+        diagonal = 2**0.5 * length
+        width, height = self.width, self.height
+
+        # Particle at (x, y) has index x*height + y
+        offsets = [(x*length, y*length) for x in range(width) for y in range(height)]
+        springs = []
+        for x in range(width):
+            for y in range(height):
+                neighbours = []
 
                 # Top, right, bottom and left springs
-                if x > 0: particle.neighbours.append([particles[x-1][y], game.SPRING_LENGTH])
-                if y > 0: particle.neighbours.append([particles[x][y-1], game.SPRING_LENGTH])
-                if x < self.width-1: particle.neighbours.append([particles[x+1][y], game.SPRING_LENGTH])
-                if y < self.height-1: particle.neighbours.append([particles[x][y+1], game.SPRING_LENGTH])
+                if x > 0: neighbours.append(((x-1)*height + y, length))
+                if y > 0: neighbours.append((x*height + y-1, length))
+                if x < width-1: neighbours.append(((x+1)*height + y, length))
+                if y < height-1: neighbours.append((x*height + y+1, length))
 
                 # Diagonal springs, length of spring is longer
-                if x > 0 and y > 0: particle.neighbours.append([particles[x-1][y-1], 2**0.5*game.SPRING_LENGTH])
-                if x < self.width-1 and y > 0: particle.neighbours.append([particles[x+1][y-1], 2**0.5*game.SPRING_LENGTH])
-                if x > 0 and y < self.height-1: particle.neighbours.append([particles[x-1][y+1], 2**0.5*game.SPRING_LENGTH])
-                if x < self.width-1 and y < self.height-1: particle.neighbours.append([particles[x+1][y+1], 2**0.5*game.SPRING_LENGTH])
+                if x > 0 and y > 0: neighbours.append(((x-1)*height + y-1, diagonal))
+                if x < width-1 and y > 0: neighbours.append(((x+1)*height + y-1, diagonal))
+                if x > 0 and y < height-1: neighbours.append(((x-1)*height + y+1, diagonal))
+                if x < width-1 and y < height-1: neighbours.append(((x+1)*height + y+1, diagonal))
+
+                springs.append(neighbours)
+
+        # Clockwise around the edge, starting at the top left
+        boundary = list(dict.fromkeys([x*height for x in range(width)]
+                                      + [(width-1)*height + y for y in range(1, height)]
+                                      + [x*height + height-1 for x in range(width-2, -1, -1)]
+                                      + [y for y in range(height-2, 0, -1)]))
 
-                self.particles.append(particle)
+        return SoftBodyTemplate(offsets, springs, boundary)
+
+    def spawn_particles(self) -> None:
+        self.template = self.get_template()
+        self.stamp_template()
+
+    def stamp_template(self) -> None:
+        """Creates the particles and springs of `template` at this SoftBody's position"""
+        template = self.template
+        x, y, colour = self.pos.x, self.pos.y, self.colour
+        particles = [SoftBodyParticle(Vector(x + dx, y + dy), colour=colour) for dx, dy in template.offsets]
+        for particle, springs in zip(particles, template.springs):
+            particle.neighbours = [[particles[idx], length] for idx, length in springs]
+        self.particles = particles
+        self.boundary = [particles[idx] for idx in template.boundary]
+
+    def energy(self) -> float:
+        """Kinetic, gravitational and spring energy of all the particles"""
+        return sum(particle.energy() + particle.spring_energy() for particle in self.particles)
+
+    def max_strain(self) -> float:
+        """The largest extension / length of any spring, 0 if the springs are all at rest"""
+        return max((abs(particle.pos.distance_to(neighbour.pos) - length) / length
+                    for particle in self.particles for neighbour, length in particle.neighbours), default=0)
+
+    def update_bounds(self) -> None:
+        """Sets `bounds` to the (min x, min y, max x, max y) of the boundary particles"""
+        xs = [particle.pos.x for particle in self.boundary]
+        ys = [particle.pos.y for particle in self.boundary]
+        self.bounds = min(xs), min(ys), max(xs), max(ys)
+
+    def collide_rect_corners(self) -> None:
+        """
+        Pushes this SoftBody's boundary edges off Rect corners
+
+        Particles are already kept out of Rects, but a corner can still get between two particles,
+        so any corner inside the boundary loop pushes the edge it went through (the first edge crossed
+        going from the Rect's centre to the corner) towards the corner, by at most `game.SPRING_LENGTH`
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        polygon = None
+        for obj in game.OBJECTS:
+            if not isinstance(obj, Rect): continue
+
+            # Skip Rects which don't overlap
+            rect_min_x, rect_min_y, rect_max_x, rect_max_y = obj.bounds
+            if min_x > rect_max_x or max_x < rect_min_x or min_y > rect_max_y or max_y < rect_min_y: continue
+
+            for corner in obj.corners:
+                if not (min_x <= corner.x <= max_x and min_y <= corner.y <= max_y): continue
+
+                if polygon is None: polygon = [particle.pos.to_tuple() for particle in self.boundary]
+                if not point_in_polygon(corner.x, corner.y, polygon): continue
+
+                crossed = None
+                for a, b in zip(self.boundary, self.boundary[1:] + self.boundary[:1]):
+                    intersection = segment_intersection(obj.pos, corner, a.pos, b.pos)
+                    if intersection and (crossed is None or intersection[0] < crossed[2]):
+                        crossed = a, b, *intersection
+                if crossed is None: continue  # The Rect's centre is inside the SoftBody, there is no edge to push
+                a, b, s, t = crossed
+
+                # Move the crossing point towards the corner, the nearer particle moves further
+                push = (corner - obj.pos) * (1 - s)
+                if not push: continue
+                push.clamp(game.SPRING_LENGTH)
+                scale = 1 / ((1 - t)**2 + t**2)
+                a.pos += push * (1 - t) * scale
+                b.pos += push * t * scale
+
+                # Reflect the velocity of the particles going into the Rect
+                normal = push / push.magnitude()
+                for particle in (a, b):
+                    speed = particle.velocity.dot(normal)
+                    if speed < 0:
+                        particle.velocity -= normal * (1 + game.RESTITUTION) * speed
+
+                polygon = None
+
+    def collide_soft_bodies(self) -> None:
+        """
+        Pushes this SoftBody's boundary particles out of other SoftBodies
+
+        Only boundary particles are tested, against the other SoftBody's boundary loop,
+        as the inside particles can only get into another SoftBody after a boundary particle has
+
+        The push is along the penetration normal, shared between the particle and the other SoftBody's edge,
+        and is at most `game.SPRING_LENGTH / 4` per update, so deep overlaps separate over a few updates
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        for obj in game.OBJECTS:
+            if obj is self or not isinstance(obj, SoftBody): continue
+
+            # Skip SoftBodies which don't overlap
+            other_min_x, other_min_y, other_max_x, other_max_y = obj.bounds
+            if min_x > other_max_x or max_x < other_min_x or min_y > other_max_y or max_y < other_min_y: continue
+
+            polygon = None
+            for particle in self.boundary:
+                x, y = particle.pos.x, particle.pos.y
+                if not (other_min_x <= x <= other_max_x and other_min_y <= y <= other_max_y): continue
+
+                if polygon is None: polygon = [other.pos.to_tuple() for other in obj.boundary]
+                if not point_in_polygon(x, y, polygon): continue
+
+                a, b, closest = min(((a, b, closest_point_on_segment(particle.pos, a.pos, b.pos))
+                                     for a, b in zip(obj.boundary, obj.boundary[1:] + obj.boundary[:1])),
+                                    key=lambda edge: particle.pos.distance_to(edge[2]))
+                push = closest - particle.pos
+                if push.magnitude() > game.SPRING_LENGTH / 2:
+                    # Too deep for the closest edge to be the way out, so push away from the other SoftBody's centre
+                    centre = Vector(sum(other.pos.x for other in obj.boundary), sum(other.pos.y for other in obj.boundary)) / len(obj.boundary)
+                    push = particle.pos - centre
+                if not push: continue
+                normal = push / push.magnitude()
+                push.clamp(game.SPRING_LENGTH / 4)
+
+                # Half the push moves the particle out, the other half moves the edge back, the nearer particle moves further
+                line = b.pos - a.pos
+                t = line.dot(closest - a.pos) / line.dot(line) if line else 0
+                scale = 1 / ((1 - t)**2 + t**2)
+                particle.pos += push / 2
+                a.pos -= push * (1 - t) * scale / 2
+                b.pos -= push * t * scale / 2
+
+                # Bounce if the particle is moving into the edge, the impulse is shared like the push
+                edge_velocity = a.velocity * (1 - t) + b.velocity * t
+                speed = (particle.velocity - edge_velocity).dot(normal)
+                if speed < 0:
+                    impulse = normal * (-(1 + game.RESTITUTION) * speed / 2)
+                    particle.velocity += impulse
+                    a.velocity -= impulse * (1 - t) * scale
+                    b.velocity -= impulse * t * scale
+
+                polygon = None
 
     def update(self, delta_time: float) -> None:
         # The spring acceleration for all particles must be calculated before moving any particles
@@ -371,25 +735,15 @@ class SoftBody(Object):
         for particle in self.particles:
             particle.update(delta_time)
 
+        self.update_bounds()
+        self.collide_rect_corners()
+        self.collide_soft_bodies()
+
     def draw_outline(self) -> None:
-        particles: list[SoftBodyParticle] = []
-        for particle in self.particles:
-            if len(particle.neighbours) < 8:
-                particles.append(particle)
-
-        particles = [particle.pos.to_tuple() for particle in particles]
-        pygame.draw.lines(game.WIN, game.CYAN, False, particles[:self.height], width=6)
-        pygame.draw.lines(game.WIN, game.CYAN, False, particles[-self.height:], width=6)
-        a, b = [particles[0]], [particles[self.height-1]]
-        x = False
-        for particle in particles[self.height:-self.height]:
-            x = not x
-            if x: a.append(particle)
-            else: b.append(particle)
-        a.append(particles[-self.height])
-        b.append(particles[-1])
-        pygame.draw.lines(game.WIN, game.CYAN, False, a, width=6)
-        pygame.draw.lines(game.WIN, game.CYAN, False, b, width=6)
+        points = [particle.pos.to_tuple() for particle in self.boundary]
+        if game.FILL:
+            pygame.draw.polygon(game.WIN, self.colour, points)
+        pygame.draw.lines(game.WIN, game.CYAN, True, points, width=6)
 
     def draw(self) -> None:
         if game.OUTLINE:
@@ -410,65 +764,126 @@ class CircularSoftBody(SoftBody):
 
     `height` is number of particles per layer
     """
-    def spawn_particles(self) -> None:
-        particles: list[list[SoftBodyParticle]] = []
-        angle = math.tau / self.height
-        for layer in range(self.width):
-            particles.append([])
+    def create_template(self) -> SoftBodyTemplate:
+        layers, height = self.width, self.height
+        angle = math.tau / height
+
+        # The middle particle has index 0, particle i of layer idx has index 1 + idx*height + i
+        offsets = [(0, 0)]
+        for layer in range(layers):
             length = game.SPRING_LENGTH * (layer+1)
-            for i in range(self.height):
-                pos = self.pos + Vector(length*math.sin(i*angle), length*math.cos(i*angle))
-                particles[layer].append(SoftBodyParticle(pos, colour=self.colour))
-
-        #middle_particle = ImmovableSoftBodyParticle(self.pos, colour=game.GREEN)
-        middle_particle = SoftBodyParticle(self.pos, colour=self.colour)
-
-        for idx, layer in enumerate(particles):
-            adjacent_length = layer[0].pos.distance_to(layer[1].pos)
-            if idx != 0: inner_diagonal_length = layer[0].pos.distance_to(particles[idx-1][1].pos)
-            if idx != self.width-1: outer_diagonal_length = layer[0].pos.distance_to(particles[idx+1][1].pos)
-            for i, particle in enumerate(layer):
-                # Left particle
-                if i == 0: particle.neighbours.append([layer[-1], adjacent_length])
-                else: particle.neighbours.append([layer[i-1], adjacent_length])
-
-                # Right particle
-                if i == self.height-1: particle.neighbours.append([layer[0], adjacent_length])
-                else: particle.neighbours.append([layer[i+1], adjacent_length])
+            for i in range(height):
+                offsets.append((length*math.sin(i*angle), length*math.cos(i*angle)))
+
+        def index(layer: int, i: int) -> int:
+            return 1 + layer*height + i % height
+
+        def distance(a: int, b: int) -> float:
+            return math.dist(offsets[a], offsets[b])
+
+        springs: list[list[tuple[int, float]]] = [[(index(0, i), game.SPRING_LENGTH) for i in range(height)]]
+        for idx in range(layers):
+            adjacent_length = distance(index(idx, 0), index(idx, 1))
+            if idx != 0: inner_diagonal_length = distance(index(idx, 0), index(idx-1, 1))
+            if idx != layers-1: outer_diagonal_length = distance(index(idx, 0), index(idx+1, 1))
+            for i in range(height):
+                # Left and right particles
+                neighbours = [(index(idx, i-1), adjacent_length), (index(idx, i+1), adjacent_length)]
 
                 # Inner particles
-                if idx == 0: particle.neighbours.append([middle_particle, game.SPRING_LENGTH])
+                if idx == 0: neighbours.append((0, game.SPRING_LENGTH))
                 else:
-                    # Middle
-                    particle.neighbours.append([particles[idx-1][i], game.SPRING_LENGTH])
-                    # Left
-                    if i == 0: particle.neighbours.append([particles[idx-1][-1], inner_diagonal_length])
-                    else: particle.neighbours.append([particles[idx-1][i-1], inner_diagonal_length])
-                    # Right
-                    if i == self.height-1: particle.neighbours.append([particles[idx-1][0], inner_diagonal_length])
-                    else: particle.neighbours.append([particles[idx-1][i+1], inner_diagonal_length])
-
-                # Outer particle
-                if idx != self.width-1:
-                    # Middle
-                    particle.neighbours.append([particles[idx+1][i], game.SPRING_LENGTH])
-                    # Left
-                    if i == 0: particle.neighbours.append([particles[idx+1][-1], outer_diagonal_length])
-                    else: particle.neighbours.append([particles[idx+1][i-1], outer_diagonal_length])
-                    # Right
-                    if i == self.height-1: particle.neighbours.append([particles[idx+1][0], outer_diagonal_length])
-                    else: particle.neighbours.append([particles[idx+1][i+1], outer_diagonal_length])
-
-        for particle in particles[0]:
-            middle_particle.neighbours.append([particle, game.SPRING_LENGTH])
-        self.particles.append(middle_particle)
-
-        for layer in particles:
-            for particle in layer:
-                self.particles.append(particle)
+                    neighbours.append((index(idx-1, i), game.SPRING_LENGTH))
+                    neighbours.append((index(idx-1, i-1), inner_diagonal_length))
+                    neighbours.append((index(idx-1, i+1), inner_diagonal_length))
+
+                # Outer particles
+                if idx != layers-1:
+                    neighbours.append((index(idx+1, i), game.SPRING_LENGTH))
+                    neighbours.append((index(idx+1, i-1), outer_diagonal_length))
+                    neighbours.append((index(idx+1, i+1), outer_diagonal_length))
+
+                springs.append(neighbours)
+
+        # The outer layer
+        boundary = [index(layers-1, i) for i in range(height)]
+
+        return SoftBodyTemplate(offsets, springs, boundary)
 
-    def draw_outline(self) -> None:
-        pygame.draw.lines(game.WIN, game.CYAN, True, [particle.pos.to_tuple() for particle in self.particles[-self.height:]], width=6)
+
+
+class PolygonSoftBody(SoftBody):
+    """
+    A SoftBody in the shape of any (non self-intersecting) polygon, which is filled with a triangle mesh
+
+    `outline` is the corners of the polygon, relative to `pos`
+
+    `resolution` is the distance between particles in pixels, larger is fewer particles, defaults to `game.SPRING_LENGTH`
+
+    `width` and `height` are the size of the polygon in pixels
+    """
+    __slots__ = ("outline", "resolution")
+    def __init__(self, pos: Vector, outline: list[Vector], resolution: float | None = None, colour: Colour = game.RED) -> None:
+        # Repeated points would make zero length springs, e.g. when the outline is closed by repeating the first point
+        points = [point.to_tuple() for point in outline]
+        self.outline = tuple(point for idx, point in enumerate(points) if point != points[idx-1])
+        if len(self.outline) < 3: raise ValueError(f"outline must have at least 3 different points, not {len(self.outline)}")
+
+        if resolution is None: resolution = game.SPRING_LENGTH
+        if resolution <= 0: raise ValueError(f"resolution must be more than 0, not {resolution}")
+        self.resolution = resolution
+        width = max(x for x, _ in self.outline) - min(x for x, _ in self.outline)
+        height = max(y for _, y in self.outline) - min(y for _, y in self.outline)
+        super().__init__(pos, width, height, colour)
+
+    def copy_to(self, pos: Vector) -> PolygonSoftBody:
+        body = super().copy_to(pos)
+        body.outline = self.outline
+        body.resolution = self.resolution
+        return body
+
+    def template_key(self) -> tuple:
+        return type(self), self.outline, self.resolution
+
+    def create_template(self) -> SoftBodyTemplate:
+        outline, resolution = self.outline, self.resolution
+
+        # Split the outline's edges so particles are at most `resolution` apart, these are the boundary particles
+        offsets: list[tuple[float, float]] = []
+        for (x1, y1), (x2, y2) in zip(outline, outline[1:] + outline[:1]):
+            n = max(1, math.ceil(math.dist((x1, y1), (x2, y2)) / resolution))
+            for k in range(n):
+                offsets.append((x1 + (x2 - x1)*k/n, y1 + (y2 - y1)*k/n))
+        boundary = list(range(len(offsets)))
+
+        # Fill the inside with a triangular lattice, keeping away from the boundary so there aren't tiny triangles
+        min_x, max_x = min(x for x, _ in outline), max(x for x, _ in outline)
+        min_y, max_y = min(y for _, y in outline), max(y for _, y in outline)
+        row_gap = resolution * 3**0.5 / 2
+        for row in range(int((max_y - min_y) / row_gap) + 1):
+            y = min_y + row*row_gap
+            for column in range(int((max_x - min_x) / resolution) + 2):
+                x = min_x + (column + row % 2 / 2) * resolution
+                if not point_in_polygon(x, y, outline): continue
+                if any(math.dist((x, y), offsets[idx]) < resolution / 2 for idx in boundary): continue
+                offsets.append((x, y))
+
+        # Springs are the edges of the triangles inside the polygon, and the edges of the boundary
+        edges: set[tuple[int, int]] = {(min(a, b), max(a, b)) for a, b in zip(boundary, boundary[1:] + boundary[:1])}
+        for a, b, c in triangulate(offsets):
+            centre_x = (offsets[a][0] + offsets[b][0] + offsets[c][0]) / 3
+            centre_y = (offsets[a][1] + offsets[b][1] + offsets[c][1]) / 3
+            if not point_in_polygon(centre_x, centre_y, outline): continue
+            for edge in ((a, b), (b, c), (c, a)):
+                edges.add((min(edge), max(edge)))
+
+        springs: list[list[tuple[int, float]]] = [[] for _ in offsets]
+        for a, b in edges:
+            length = math.dist(offsets[a], offsets[b])
+            springs[a].append((b, length))
+            springs[b].append((a, length))
+
+        return SoftBodyTemplate(offsets, springs, boundary)
 
 
 
@@ -480,7 +895,7 @@ class Rect(Object):
 
     `outline` is the width of the outline, 0 is filled rectangle
     """
-    __slots__ = ("width", "height", "_rotation", "outline", "surf", "tl", "tr", "br", "bl")
+    __slots__ = ("width", "height", "_rotation", "outline", "surf", "tl", "tr", "br", "bl", "bounds")
     def __init__(self, pos: Vector, width: int, height: int, rotation: float = 0, colour: Colour = game.WHITE, outline: int = 5) -> None:
         super().__init__(pos, colour)
         self.width = width
@@ -499,6 +914,10 @@ class Rect(Object):
         self.br = self.pos + Vector(self.width/2, self.height/2).rotated(self._rotation)
         self.bl = self.pos + Vector(-self.width/2, self.height/2).rotated(self._rotation)
 
+        xs = [corner.x for corner in self.corners]
+        ys = [corner.y for corner in self.corners]
+        self.bounds = min(xs), min(ys), max(xs), max(ys)
+
     @property
     def rotation(self) -> float:
         """Rect.rotation is degrees, Rect._rotation is radians"""
@@ -512,6 +931,11 @@ class Rect(Object):
     def corners(self) -> tuple[Vector]:
         return self.tl, self.tr, self.bl, self.br
 
+    def penetration(self, point: Vector) -> float:
+        """How far `point` is inside this Rect, 0 if it's outside"""
+        local = (point - self.pos).rotated(-self._rotation)
+        return max(0, min(self.width/2 - abs(local.x), self.height/2 - abs(local.y)))
+
     def create_surface(self) -> pygame.Surface:
         surf = pygame.Surface((self.width, self.height), flags=pygame.SRCALPHA)
         pygame.draw.rect(surf, self.colour, (0, 0, self.width, self.height), width=self.outline)
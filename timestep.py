@@ -0,0 +1,97 @@
+import game
+from objects import Particle, SoftBody, all_particles
+from typing import Callable
+import math
+
+
+
+class Timestep():
+    """
+    Picks the largest time step which is safe for the current state of the simulation,
+    so calm scenes take one step per frame and violent scenes split each frame into smaller steps
+
+    The step is limited by:
+    - `game.MAX_TIMESTEP`, even when nothing is moving
+    - speed, no particle can move more than `game.COURANT` of it's size in one step
+    - stiffness, the springs blow up if the step is longer than 2 / (angular frequency of the stiffest particle)
+    - error (optional), estimated from how much the velocities change in a step, see `game.TIMESTEP_TOLERANCE`
+    """
+    def __init__(self) -> None:
+        self.step = 0
+        self.substeps = 0
+        self.error_scale = 1  # Shrinks when the error is over the tolerance, and grows back when it's under
+        self.energy_drift = 0  # Change in total energy per second, averaged over about `game.ENERGY_DRIFT_WINDOW` seconds
+
+    def stable_step(self) -> float:
+        max_speed = 0
+        min_size = math.inf
+        max_stiffness = 0
+        for obj in game.OBJECTS:
+            if isinstance(obj, SoftBody):
+                max_stiffness = max(max_stiffness, obj.template.stiffness)
+                particles = obj.particles
+            elif isinstance(obj, Particle):
+                particles = (obj,)
+            else:
+                continue
+
+            for particle in particles:
+                max_speed = max(max_speed, particle.velocity.x**2 + particle.velocity.y**2)
+                min_size = min(min_size, particle.size)
+        max_speed **= 0.5
+
+        step = game.MAX_TIMESTEP
+        if max_speed:
+            step = min(step, game.COURANT * min_size / max_speed)
+
+        if max_stiffness:
+            # The stiffness of a particle is at most 2 * the sum of the stiffness of it's springs (as mass == 1)
+            angular_frequency = (2 * game.SPRING_COEFFICIENT * max_stiffness) ** 0.5
+            step = min(step, game.TIMESTEP_SAFETY * 2 / angular_frequency)
+
+        return step * self.error_scale
+
+    def total_energy(self) -> float:
+        return sum(obj.energy() for obj in game.OBJECTS if isinstance(obj, (Particle, SoftBody)))
+
+    def take_step(self, delta_time: float, update: Callable[[float], None]) -> None:
+        if not game.TIMESTEP_TOLERANCE:
+            update(delta_time)
+            return
+
+        velocities = [(particle, particle.velocity.x, particle.velocity.y) for particle in all_particles()]
+        update(delta_time)
+
+        # The position error of a step is about the difference between moving with the old and new velocity
+        error = 0.5 * delta_time * max((math.hypot(particle.velocity.x - x, particle.velocity.y - y)
+                                        for particle, x, y in velocities), default=0)
+        if error > game.TIMESTEP_TOLERANCE:
+            # The error is proportional to delta_time ** 2
+            self.error_scale *= max(0.2, 0.9 * (game.TIMESTEP_TOLERANCE / error) ** 0.5)
+        else:
+            self.error_scale = min(1, self.error_scale * 1.2)
+
+    def advance(self, frame_time: float, update: Callable[[float], None]) -> float:
+        """
+        Moves the simulation forward by `frame_time`, in equal steps which are no longer than the stable step
+
+        At most `game.MAX_SUBSTEPS` steps are taken, so the simulation slows down instead of freezing if it can't keep up
+
+        Returns how much time was simulated
+        """
+        if not frame_time: return 0
+        if game.REPORT_ENERGY: energy = self.total_energy()
+
+        stable_step = self.stable_step()
+        self.substeps = min(math.ceil(frame_time / stable_step), game.MAX_SUBSTEPS)
+        self.step = min(frame_time / self.substeps, stable_step)
+        for _ in range(self.substeps):
+            self.take_step(self.step, update)
+        elapsed = self.step * self.substeps
+
+        if game.REPORT_ENERGY and elapsed:
+            # One frame's change is mostly noise from collisions, so it's an exponential moving average
+            drift = (self.total_energy() - energy) / elapsed
+            self.energy_drift += (drift - self.energy_drift) * min(1, elapsed / game.ENERGY_DRIFT_WINDOW)
+
+        return elapsed